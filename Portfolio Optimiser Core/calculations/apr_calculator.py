@@ -1,12 +1,69 @@
 from typing import Tuple, List
-from decimal import Decimal
 from web3.contract import Contract
+from cachetools import TTLCache
+import numpy as np
+from eth_abi import encode, decode
+from eth_utils import function_signature_to_4byte_selector
 import math
 
+# Multicall3 is deployed at the same address on BSC (and most chains)
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+_AGGREGATE3_SELECTOR = function_signature_to_4byte_selector('aggregate3((address,bytes,bool)[])')
+_TOTAL_ALLOC_POINT_CALLDATA = function_signature_to_4byte_selector('totalAllocPoint()')
+_POOL_INFO_SELECTOR = function_signature_to_4byte_selector('poolInfo(uint256)')
+
 class APRCalculator:
+    """
+    APR/APY math over AsyncWeb3 contracts - every .call() is awaited so
+    concurrent calculate_* invocations overlap under asyncio.gather
+    instead of serializing on blocking HTTP round trips
+    """
     def __init__(self, blocks_per_year: int = 10512000):  # BSC blocks per year
         self.BLOCKS_PER_YEAR = blocks_per_year
-        self.PRECISION = Decimal('1e18')
+
+        # Emissions and alloc points only move when governance acts, so the
+        # batched farm state can be reused across pools for a short window.
+        # 30s is the conservative TTL since the batch also carries poolInfo.
+        self._chain_cache = TTLCache(maxsize=1024, ttl=30)
+
+        # Constant-folded blocks_per_year / 1e18 scale shared by the
+        # emission-to-yearly-USD conversions below
+        self._block_scale = self.BLOCKS_PER_YEAR / 1e18
+
+    async def _fetch_farm_state(self, masterchef: Contract, pid: int, reward_fn_name: str) -> Tuple[int, int, int]:
+        """
+        Fetch per-block emissions, totalAllocPoint and poolInfo(pid) in one RPC
+        Packs all three view calls into a single Multicall3 aggregate3 eth_call
+        instead of issuing sequential round trips to the node
+        Results are cached briefly per (contract, reward_fn, pid)
+        Returns (reward_per_block, total_alloc_points, pool_alloc_points)
+        """
+        cache_key = (masterchef.address, reward_fn_name, pid)
+        cached = self._chain_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        calls = [
+            (masterchef.address, function_signature_to_4byte_selector(f'{reward_fn_name}()')),
+            (masterchef.address, _TOTAL_ALLOC_POINT_CALLDATA),
+            (masterchef.address, _POOL_INFO_SELECTOR + encode(['uint256'], [pid])),
+        ]
+        payload = _AGGREGATE3_SELECTOR + encode(
+            ['(address,bytes,bool)[]'],
+            [[(target, calldata, False) for target, calldata in calls]]
+        )
+        raw = await masterchef.w3.eth.call({'to': MULTICALL3_ADDRESS, 'data': payload})
+        results = decode(['(bool,bytes)[]'], raw)[0]
+
+        reward_per_block = decode(['uint256'], results[0][1])[0]
+        total_alloc_points = decode(['uint256'], results[1][1])[0]
+        # poolInfo layouts differ between masterchefs but allocPoint is always
+        # the second head word (first is the lp/stake token address)
+        pool_alloc_points = int.from_bytes(results[2][1][32:64], 'big')
+
+        state = (reward_per_block, total_alloc_points, pool_alloc_points)
+        self._chain_cache[cache_key] = state
+        return state
 
     async def calculate_pancake_apr(self, 
         pid: int, 
@@ -20,18 +77,18 @@ class APRCalculator:
         Formula: (CAKE_per_block * blocks_per_year * CAKE_price * pool_alloc_points) / (total_alloc_points * pool_tvl)
         """
         try:
-            # Get CAKE emissions per block
-            cake_per_block = Decimal(str(masterchef.functions.cakePerBlock().call()))
-            total_alloc_points = Decimal(str(masterchef.functions.totalAllocPoint().call()))
-            pool_alloc_points = Decimal(str(pool_info[1]))  # allocPoint from poolInfo
+            if pool_tvl == 0:
+                return 0
 
-            if total_alloc_points == 0 or pool_tvl == 0:
+            # Get CAKE emissions, total and pool alloc points in one batched call
+            cake_per_block, total_alloc_points, pool_alloc_points = \
+                await self._fetch_farm_state(masterchef, pid, 'cakePerBlock')
+
+            if total_alloc_points == 0:
                 return 0
 
-            yearly_cake_rewards = (cake_per_block * self.BLOCKS_PER_YEAR * pool_alloc_points) / total_alloc_points
-            yearly_cake_usd = yearly_cake_rewards * Decimal(str(cake_price)) / self.PRECISION
-            
-            apr = (yearly_cake_usd / Decimal(str(pool_tvl))) * 100
+            yearly_cake_usd = cake_per_block * pool_alloc_points / total_alloc_points * cake_price * self._block_scale
+            apr = yearly_cake_usd / pool_tvl * 100.0
             return float(apr)
 
         except Exception as e:
@@ -40,37 +97,47 @@ class APRCalculator:
     async def calculate_venus_rates(self, market_contract: Contract) -> Tuple[float, float]:
         """
         Calculate Venus supply and borrow APY
-        Formula: ((1 + rate_per_block * blocks_per_year) - 1) * 100
+        Formula: ((1 + rate_per_block)^blocks_per_year - 1) * 100
         """
         try:
-            supply_rate = Decimal(str(market_contract.functions.supplyRatePerBlock().call()))
-            borrow_rate = Decimal(str(market_contract.functions.borrowRatePerBlock().call()))
+            supply_rate = await market_contract.functions.supplyRatePerBlock().call()
+            borrow_rate = await market_contract.functions.borrowRatePerBlock().call()
 
-            # Convert per-block rates to APY
-            supply_apy = ((Decimal('1') + supply_rate * self.BLOCKS_PER_YEAR / self.PRECISION) - Decimal('1')) * 100
-            borrow_apy = ((Decimal('1') + borrow_rate * self.BLOCKS_PER_YEAR / self.PRECISION) - Decimal('1')) * 100
+            # Convert per-block rates to compounded APY; log1p/expm1 stay
+            # numerically stable for the tiny per-block rates involved
+            supply_apy = math.expm1(math.log1p(supply_rate * 1e-18) * self.BLOCKS_PER_YEAR) * 100
+            borrow_apy = math.expm1(math.log1p(borrow_rate * 1e-18) * self.BLOCKS_PER_YEAR) * 100
 
             return float(supply_apy), float(borrow_apy)
 
         except Exception as e:
             raise Exception(f"Error calculating Venus rates: {str(e)}")
 
+    def calculate_venus_rates_batch(self, rates: np.ndarray) -> np.ndarray:
+        """
+        Vectorized Venus APY conversion for an array of per-block rates
+        Same formula as calculate_venus_rates but one NumPy pass over
+        all markets instead of a Python call per market
+        """
+        rates = np.asarray(rates, dtype=np.float64)
+        return np.expm1(np.log1p(rates * 1e-18) * self.BLOCKS_PER_YEAR) * 100.0
+
     async def calculate_alpaca_base_apy(self, vault_contract: Contract) -> float:
         """
         Calculate Alpaca vault base APY from lending activities
         Formula: (total_token - total_debt) / total_token * lending_apr
         """
         try:
-            total_token = Decimal(str(vault_contract.functions.totalToken().call()))
-            total_debt = Decimal(str(vault_contract.functions.vaultDebtVal().call()))
-            
+            total_token = await vault_contract.functions.totalToken().call()
+            total_debt = await vault_contract.functions.vaultDebtVal().call()
+
             if total_token == 0:
                 return 0
 
             utilization = total_debt / total_token
             # Lending APR increases with utilization (simplified model)
-            lending_apr = utilization * Decimal('0.15') * 100  # 15% max lending APR
-            
+            lending_apr = utilization * 0.15 * 100  # 15% max lending APR
+
             return float(lending_apr)
 
         except Exception as e:
@@ -87,18 +154,17 @@ class APRCalculator:
         Formula: (ALPACA_per_block * blocks_per_year * ALPACA_price * pool_alloc_points) / (total_alloc_points * pool_tvl)
         """
         try:
-            pool_info = fairlaunch.functions.poolInfo(pid).call()
-            total_alloc_point = Decimal(str(fairlaunch.functions.totalAllocPoint().call()))
-            alpaca_per_block = Decimal(str(fairlaunch.functions.alpacaPerBlock().call()))
-            pool_alloc_points = Decimal(str(pool_info[1]))
+            if tvl == 0:
+                return 0
+
+            alpaca_per_block, total_alloc_point, pool_alloc_points = \
+                await self._fetch_farm_state(fairlaunch, pid, 'alpacaPerBlock')
 
-            if total_alloc_point == 0 or tvl == 0:
+            if total_alloc_point == 0:
                 return 0
 
-            yearly_alpaca = (alpaca_per_block * self.BLOCKS_PER_YEAR * pool_alloc_points) / total_alloc_point
-            yearly_alpaca_usd = yearly_alpaca * Decimal(str(alpaca_price)) / self.PRECISION
-            
-            apy = (yearly_alpaca_usd / Decimal(str(tvl))) * 100
+            yearly_alpaca_usd = alpaca_per_block * pool_alloc_points / total_alloc_point * alpaca_price * self._block_scale
+            apy = yearly_alpaca_usd / tvl * 100.0
             return float(apy)
 
         except Exception as e:
@@ -116,17 +182,17 @@ class APRCalculator:
         Similar to PancakeSwap but with BSW token
         """
         try:
-            bsw_per_block = Decimal(str(masterchef.functions.bswPerBlock().call()))
-            total_alloc_points = Decimal(str(masterchef.functions.totalAllocPoint().call()))
-            pool_alloc_points = Decimal(str(pool_info[1]))
+            if pool_tvl == 0:
+                return 0
+
+            bsw_per_block, total_alloc_points, pool_alloc_points = \
+                await self._fetch_farm_state(masterchef, pid, 'bswPerBlock')
 
-            if total_alloc_points == 0 or pool_tvl == 0:
+            if total_alloc_points == 0:
                 return 0
 
-            yearly_bsw = (bsw_per_block * self.BLOCKS_PER_YEAR * pool_alloc_points) / total_alloc_points
-            yearly_bsw_usd = yearly_bsw * Decimal(str(bsw_price)) / self.PRECISION
-            
-            apr = (yearly_bsw_usd / Decimal(str(pool_tvl))) * 100
+            yearly_bsw_usd = bsw_per_block * pool_alloc_points / total_alloc_points * bsw_price * self._block_scale
+            apr = yearly_bsw_usd / pool_tvl * 100.0
             return float(apr)
 
         except Exception as e:
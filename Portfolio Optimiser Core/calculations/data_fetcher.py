@@ -2,11 +2,24 @@ from typing import Dict, List, Optional, Tuple
 import aiohttp
 import asyncio
 from datetime import datetime, timedelta
+import hashlib
 import logging
+import math
+import os
 from web3 import Web3
 from web3.contract import Contract
 import json
+import orjson
 from cachetools import TTLCache, cached
+import diskcache
+
+# keccak256('Transfer(address,address,uint256)') - precomputed so log
+# queries never hash the well-known signature at call time
+TRANSFER_TOPIC = '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+ZERO_TOPIC = '0x' + '00' * 32
+
+# Creation blocks are immutable, share them across fetcher instances
+_creation_block_cache: Dict[str, int] = {}
 
 class DataFetcher:
     def __init__(self, w3: Web3):
@@ -15,7 +28,29 @@ class DataFetcher:
         
         # Cache for API responses
         self.cache = TTLCache(maxsize=100, ttl=300)  # 5 minutes cache
-        
+
+        # Protocol-wide metrics barely move within a scan burst - a short
+        # TTL keeps concurrent scanners off the DefiLlama endpoint
+        self._protocol_metrics_cache = TTLCache(maxsize=16, ttl=30)
+
+        # On-disk cache layer so repeat queries survive process restarts
+        self._disk_cache = diskcache.Cache(
+            os.path.expanduser('~/.cache/defidazzle/graphql')
+        )
+
+        # Creation blocks never change - persist them with no expiry so the
+        # binary search runs at most once per pool, ever
+        self._creation_block_disk = diskcache.Cache(
+            os.path.expanduser('~/.cache/defidazzle/creation_blocks')
+        )
+
+        # Shared HTTP session (lazily created) so connections are reused
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Concurrent identical queries share one in-flight future instead of
+        # issuing duplicate POSTs
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
         # TheGraph endpoints
         self.ENDPOINTS = {
             'pancakeswap': 'https://api.thegraph.com/subgraphs/name/pancakeswap/exchange-v2',
@@ -27,6 +62,76 @@ class DataFetcher:
         # DefiLlama API endpoint
         self.DEFILLAMA_API = 'https://api.llama.fi'
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=50,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                ),
+                json_serialize=lambda obj: orjson.dumps(obj).decode()
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _graphql(self, endpoint: str, query: str, variables: Optional[Dict] = None, ttl: int = 3600) -> Dict:
+        """
+        POST a GraphQL query, serving repeats from the in-memory TTL cache
+        with an on-disk fallback layer
+        """
+        # Digest the variables rather than hashing items directly so list
+        # values (e.g. id_in filters) key correctly
+        key = (
+            endpoint,
+            hashlib.sha256(query.encode()).hexdigest(),
+            hashlib.sha256(orjson.dumps(variables or {}, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        )
+
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        data = self._disk_cache.get(key)
+        if data is not None:
+            self.cache[key] = data
+            return data
+
+        # Single-flight: concurrent callers of the same uncached query wait
+        # on the first request instead of each hitting the endpoint
+        fut = self._inflight.get(key)
+        if fut is not None:
+            return await fut
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            session = await self._get_session()
+            async with session.post(
+                endpoint,
+                json={'query': query, 'variables': variables or {}}
+            ) as response:
+                data = orjson.loads(await response.read())
+
+            if 'errors' in data:
+                raise Exception(f"GraphQL error: {data['errors']}")
+
+            self.cache[key] = data
+            self._disk_cache.set(key, data, expire=ttl)
+            fut.set_result(data)
+            return data
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved in case nobody else is waiting
+            raise
+        finally:
+            del self._inflight[key]
+
     async def get_total_value_locked_history(self, pool_address: str, days: int = 30) -> List[float]:
         """Get TVL history for a specific pool"""
         try:
@@ -49,21 +154,13 @@ class DataFetcher:
                 "days": days
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.ENDPOINTS['pancakeswap'],
-                    json={'query': query, 'variables': variables}
-                ) as response:
-                    data = await response.json()
-                    
-                    if 'errors' in data:
-                        raise Exception(f"GraphQL error: {data['errors']}")
-                    
-                    tvl_history = [
-                        float(day['reserveUSD']) 
-                        for day in reversed(data['data']['pairDayDatas'])
-                    ]
-                    return tvl_history
+            data = await self._graphql(self.ENDPOINTS['pancakeswap'], query, variables)
+
+            tvl_history = [
+                float(day['reserveUSD'])
+                for day in reversed(data['data']['pairDayDatas'])
+            ]
+            return tvl_history
 
         except Exception as e:
             self.logger.error(f"Error fetching TVL history: {str(e)}")
@@ -82,48 +179,64 @@ class DataFetcher:
             protocol_id = protocol_ids.get(protocol.lower())
             if not protocol_id:
                 raise ValueError(f"Unknown protocol: {protocol}")
-            
-            async with aiohttp.ClientSession() as session:
-                # Get TVL data
-                async with session.get(
-                    f"{self.DEFILLAMA_API}/protocol/{protocol_id}"
-                ) as response:
-                    data = await response.json()
-                    
-                    metrics = {
-                        'tvl': data['tvl'][-1]['totalLiquidityUSD'],
-                        'tvl_change_24h': self._calculate_change(
-                            data['tvl'][-2]['totalLiquidityUSD'],
-                            data['tvl'][-1]['totalLiquidityUSD']
-                        ),
-                        'mcap_tvl_ratio': data.get('mcap', 0) / data['tvl'][-1]['totalLiquidityUSD']
-                        if data.get('mcap') else 0
-                    }
-                    
-                    return metrics
+
+            cached = self._protocol_metrics_cache.get(protocol_id)
+            if cached is not None:
+                return cached
+
+            session = await self._get_session()
+            # Get TVL data
+            async with session.get(
+                f"{self.DEFILLAMA_API}/protocol/{protocol_id}"
+            ) as response:
+                data = orjson.loads(await response.read())
+
+                metrics = {
+                    'tvl': data['tvl'][-1]['totalLiquidityUSD'],
+                    'tvl_change_24h': self._calculate_change(
+                        data['tvl'][-2]['totalLiquidityUSD'],
+                        data['tvl'][-1]['totalLiquidityUSD']
+                    ),
+                    'mcap_tvl_ratio': data.get('mcap', 0) / data['tvl'][-1]['totalLiquidityUSD']
+                    if data.get('mcap') else 0
+                }
+
+                self._protocol_metrics_cache[protocol_id] = metrics
+                return metrics
 
         except Exception as e:
             self.logger.error(f"Error fetching protocol metrics: {str(e)}")
             raise
 
     async def get_pool_creation_block(self, pool_address: str) -> int:
-        """Get the block number when the pool was created"""
+        """
+        Get the block number when the pool was created
+        Binary-searches eth_getCode over the block range (empty code means
+        not yet deployed) - O(log N) RPCs instead of a full-range log scan
+        that public nodes reject
+        """
         try:
-            # Get the first transfer event (pool creation)
-            creation_filter = self.w3.eth.filter({
-                'fromBlock': 0,
-                'toBlock': 'latest',
-                'address': pool_address,
-                'topics': [
-                    self.w3.keccak(text='Transfer(address,address,uint256)').hex(),
-                    '0x0000000000000000000000000000000000000000000000000000000000000000'
-                ]
-            })
-            
-            logs = creation_filter.get_all_entries()
-            if logs:
-                return logs[0]['blockNumber']
-            return 0
+            cached = _creation_block_cache.get(pool_address)
+            if cached is not None:
+                return cached
+
+            cached = self._creation_block_disk.get(pool_address)
+            if cached is not None:
+                _creation_block_cache[pool_address] = cached
+                return cached
+
+            lo, hi = 0, self.w3.eth.block_number
+            while lo < hi:
+                mid = (lo + hi) // 2
+                code = self.w3.eth.get_code(pool_address, block_identifier=mid)
+                if code in (b'', '0x'):
+                    lo = mid + 1
+                else:
+                    hi = mid
+
+            _creation_block_cache[pool_address] = lo
+            self._creation_block_disk.set(pool_address, lo)
+            return lo
 
         except Exception as e:
             self.logger.error(f"Error fetching pool creation block: {str(e)}")
@@ -140,17 +253,9 @@ class DataFetcher:
             }
             """
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.ENDPOINTS[protocol.lower()],
-                    json={'query': query}
-                ) as response:
-                    data = await response.json()
-                    
-                    if 'errors' in data:
-                        raise Exception(f"GraphQL error: {data['errors']}")
-                    
-                    return int(data['data']['pancakeFactory']['totalUsers'])
+            data = await self._graphql(self.ENDPOINTS[protocol.lower()], query)
+
+            return int(data['data']['pancakeFactory']['totalUsers'])
 
         except Exception as e:
             self.logger.error(f"Error fetching user count: {str(e)}")
@@ -177,31 +282,70 @@ class DataFetcher:
                 "pool": pool_address.lower()
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.ENDPOINTS['pancakeswap'],
-                    json={'query': query, 'variables': variables}
-                ) as response:
-                    data = await response.json()
-                    
-                    if 'errors' in data:
-                        raise Exception(f"GraphQL error: {data['errors']}")
-                    
-                    pair_data = data['data']['pair']
-                    return {
-                        'price_token0': float(pair_data['token0Price']),
-                        'price_token1': float(pair_data['token1Price']),
-                        'volume_usd': float(pair_data['volumeUSD']),
-                        'tx_count': int(pair_data['txCount']),
-                        'lp_count': int(pair_data['liquidityProviderCount']),
-                        'untracked_volume_usd': float(pair_data['untrackedVolumeUSD']),
-                        'tracked_reserve_usd': float(pair_data['trackedReserveUSD'])
-                    }
+            # Pool metrics move intra-day, keep the disk copy short-lived
+            data = await self._graphql(self.ENDPOINTS['pancakeswap'], query, variables, ttl=300)
+
+            pair_data = data['data']['pair']
+            return {
+                'price_token0': float(pair_data['token0Price']),
+                'price_token1': float(pair_data['token1Price']),
+                'volume_usd': float(pair_data['volumeUSD']),
+                'tx_count': int(pair_data['txCount']),
+                'lp_count': int(pair_data['liquidityProviderCount']),
+                'untracked_volume_usd': float(pair_data['untrackedVolumeUSD']),
+                'tracked_reserve_usd': float(pair_data['trackedReserveUSD'])
+            }
 
         except Exception as e:
             self.logger.error(f"Error fetching pool metrics: {str(e)}")
             raise
 
+    async def get_pool_metrics_batch(self, pool_addresses: List[str]) -> Dict[str, Dict]:
+        """
+        Get comprehensive metrics for many pools in one subgraph query
+        Returns a dict keyed by lowercase pool address; pools unknown to the
+        subgraph are simply absent
+        """
+        try:
+            query = """
+            query ($pools: [String!]!) {
+                pairs(where: {id_in: $pools}) {
+                    id
+                    token0Price
+                    token1Price
+                    volumeUSD
+                    txCount
+                    liquidityProviderCount
+                    untrackedVolumeUSD
+                    trackedReserveUSD
+                }
+            }
+            """
+
+            variables = {
+                "pools": sorted(address.lower() for address in pool_addresses)
+            }
+
+            # Pool metrics move intra-day, keep the disk copy short-lived
+            data = await self._graphql(self.ENDPOINTS['pancakeswap'], query, variables, ttl=300)
+
+            return {
+                pair_data['id']: {
+                    'price_token0': float(pair_data['token0Price']),
+                    'price_token1': float(pair_data['token1Price']),
+                    'volume_usd': float(pair_data['volumeUSD']),
+                    'tx_count': int(pair_data['txCount']),
+                    'lp_count': int(pair_data['liquidityProviderCount']),
+                    'untracked_volume_usd': float(pair_data['untrackedVolumeUSD']),
+                    'tracked_reserve_usd': float(pair_data['trackedReserveUSD'])
+                }
+                for pair_data in data['data']['pairs']
+            }
+
+        except Exception as e:
+            self.logger.error(f"Error fetching pool metrics batch: {str(e)}")
+            raise
+
     def _calculate_change(self, old_value: float, new_value: float) -> float:
         """Calculate percentage change between two values"""
         if old_value == 0:
@@ -214,10 +358,11 @@ class DataFetcher:
             supply_rate = await market_contract.functions.supplyRatePerBlock().call()
             borrow_rate = await market_contract.functions.borrowRatePerBlock().call()
             
-            # Convert to APY (BSC blocks per year = 10512000)
+            # Convert to APY (BSC blocks per year = 10512000); log1p/expm1
+            # stay numerically stable for the tiny per-block rates involved
             blocks_per_year = 10512000
-            supply_apy = ((1 + supply_rate / 1e18) ** blocks_per_year - 1) * 100
-            borrow_apy = ((1 + borrow_rate / 1e18) ** blocks_per_year - 1) * 100
+            supply_apy = math.expm1(math.log1p(supply_rate * 1e-18) * blocks_per_year) * 100
+            borrow_apy = math.expm1(math.log1p(borrow_rate * 1e-18) * blocks_per_year) * 100
             
             return supply_apy, borrow_apy
 
@@ -5,6 +5,19 @@ import asyncio
 import aiohttp
 from datetime import datetime, timedelta
 import logging
+import os
+import numpy as np
+import orjson
+from cachetools import TTLCache
+import diskcache
+from eth_abi import encode, decode
+from eth_utils import function_signature_to_4byte_selector
+
+# Multicall3 is deployed at the same address on BSC (and most chains)
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+_AGGREGATE3_SELECTOR = function_signature_to_4byte_selector('aggregate3((address,bytes,bool)[])')
+_GET_RESERVES_CALLDATA = function_signature_to_4byte_selector('getReserves()')
+_DECIMALS_CALLDATA = function_signature_to_4byte_selector('decimals()')
 
 class PriceCalculator:
     def __init__(self, w3, factory_contract: Contract, router_contract: Contract):
@@ -14,27 +27,80 @@ class PriceCalculator:
         self.WBNB = "0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c"
         self.BUSD = "0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56"
         self.PRECISION = Decimal('1e18')
-        
+
+        # Shared HTTP session (lazily created) so connections are reused
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # WBNB/BUSD is needed for every non-BUSD token, cache it briefly
+        self._bnb_busd_cache = TTLCache(maxsize=1, ttl=10)
+
+        # decimals() is immutable per token, cache results forever
+        self._decimals_cache: Dict[str, int] = {}
+
+        # Pair addresses never change once deployed, intern them per token pair
+        self._pair_address_cache: Dict[Tuple[str, str], str] = {}
+
+        # Well-known base pairs: (token0, token1) -> (pair address, decimals0,
+        # decimals1). Skips the factory lookup and decimals reads entirely for
+        # the hottest price path
+        self._KNOWN_PAIRS: Dict[Tuple[str, str], Tuple[str, int, int]] = {
+            (self.WBNB.lower(), self.BUSD.lower()):
+                ('0x58F876857a02D6762E0101bb5C46A8c1ED44Dc16', 18, 18),
+        }
+
+        # TheGraph history is daily-granularity, volume hourly - cache both
+        # in memory with a disk layer that survives restarts
+        self._history_cache = TTLCache(maxsize=256, ttl=3600)
+        self._volume_cache = TTLCache(maxsize=256, ttl=300)
+
+        # Reserves snapshots for price-impact math, ~1 BSC block
+        self._reserves_cache = TTLCache(maxsize=512, ttl=3)
+        self._disk_cache = diskcache.Cache(
+            os.path.expanduser('~/.cache/defidazzle/graphql')
+        )
+
         # Setup logging
         self.logger = logging.getLogger(__name__)
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=50,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                ),
+                json_serialize=lambda obj: orjson.dumps(obj).decode()
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
     async def get_token_price(self, token_address: str) -> float:
         """
         Get token price in USD using PancakeSwap pairs
-        First tries direct BUSD pair, then tries through WBNB
+        Probes the direct BUSD pair and the WBNB route concurrently
+        and uses whichever resolves
         """
         try:
-            # Try direct BUSD pair first
-            busd_price = await self._get_token_price_from_pair(token_address, self.BUSD)
-            if busd_price is not None:
+            busd_price, bnb_price, bnb_busd_price = await asyncio.gather(
+                self._get_token_price_from_pair(token_address, self.BUSD),
+                self._get_token_price_from_pair(token_address, self.WBNB),
+                self._get_bnb_busd_price(),
+                return_exceptions=True
+            )
+
+            # Prefer the direct BUSD pair
+            if isinstance(busd_price, Decimal):
                 return float(busd_price)
 
-            # If no BUSD pair, try through WBNB
-            bnb_price = await self._get_token_price_from_pair(token_address, self.WBNB)
-            if bnb_price is not None:
-                bnb_busd_price = await self._get_token_price_from_pair(self.WBNB, self.BUSD)
-                if bnb_busd_price is not None:
-                    return float(bnb_price * bnb_busd_price)
+            # Otherwise route through WBNB
+            if isinstance(bnb_price, Decimal) and isinstance(bnb_busd_price, Decimal):
+                return float(bnb_price * bnb_busd_price)
 
             raise Exception(f"No valid price path found for token {token_address}")
 
@@ -42,52 +108,72 @@ class PriceCalculator:
             self.logger.error(f"Error getting token price: {str(e)}")
             raise
 
+    async def _get_pair_address(self, token0_address: str, token1_address: str) -> str:
+        """Resolve a pair address through the factory, interning results forever"""
+        cache_key = (token0_address.lower(), token1_address.lower())
+        pair_address = self._pair_address_cache.get(cache_key)
+        if pair_address is None:
+            pair_address = await self.factory.functions.getPair(token0_address, token1_address).call()
+            # Only intern real pairs - a missing pair may be created later
+            if pair_address != "0x0000000000000000000000000000000000000000":
+                self._pair_address_cache[cache_key] = pair_address
+        return pair_address
+
+    async def _get_bnb_busd_price(self) -> Optional[Decimal]:
+        """Get the WBNB/BUSD price, served from a short TTL cache when possible"""
+        price = self._bnb_busd_cache.get('bnb_busd')
+        if price is None:
+            price = await self._get_token_price_from_pair(self.WBNB, self.BUSD)
+            if price is not None:
+                self._bnb_busd_cache['bnb_busd'] = price
+        return price
+
     async def _get_token_price_from_pair(self, token0_address: str, token1_address: str) -> Optional[Decimal]:
-        """Get token price from a specific pair"""
+        """
+        Get token price from a specific pair
+        Stage 1 resolves the pair address, stage 2 batches getReserves plus
+        any uncached decimals() reads into a single Multicall3 eth_call
+        """
         try:
-            pair_address = self.factory.functions.getPair(token0_address, token1_address).call()
+            known = self._KNOWN_PAIRS.get((token0_address.lower(), token1_address.lower()))
+            if known is not None:
+                # Known pair address and decimals - a single getReserves suffices
+                pair_address, decimals0, decimals1 = known
+                raw = self.w3.eth.call({'to': pair_address, 'data': _GET_RESERVES_CALLDATA})
+                reserves = decode(['uint112', 'uint112', 'uint32'], raw)
+
+                reserve0 = Decimal(str(reserves[0])) / Decimal(str(10 ** decimals0))
+                reserve1 = Decimal(str(reserves[1])) / Decimal(str(10 ** decimals1))
+
+                if reserve0 == 0 or reserve1 == 0:
+                    return None
+                return reserve1 / reserve0
+
+            pair_address = await self._get_pair_address(token0_address, token1_address)
             if pair_address == "0x0000000000000000000000000000000000000000":
                 return None
 
-            pair_contract = self.w3.eth.contract(
-                address=pair_address,
-                abi=[{
-                    "inputs": [],
-                    "name": "getReserves",
-                    "outputs": [
-                        {"internalType": "uint112", "name": "_reserve0", "type": "uint112"},
-                        {"internalType": "uint112", "name": "_reserve1", "type": "uint112"},
-                        {"internalType": "uint32", "name": "_blockTimestampLast", "type": "uint32"}
-                    ],
-                    "stateMutability": "view",
-                    "type": "function"
-                }]
-            )
+            calls = [(pair_address, _GET_RESERVES_CALLDATA)]
+            for token in (token0_address, token1_address):
+                if token not in self._decimals_cache:
+                    calls.append((token, _DECIMALS_CALLDATA))
 
-            reserves = pair_contract.functions.getReserves().call()
-            token0 = self.w3.eth.contract(
-                address=token0_address,
-                abi=[{
-                    "inputs": [],
-                    "name": "decimals",
-                    "outputs": [{"internalType": "uint8", "name": "", "type": "uint8"}],
-                    "stateMutability": "view",
-                    "type": "function"
-                }]
-            )
-            token1 = self.w3.eth.contract(
-                address=token1_address,
-                abi=[{
-                    "inputs": [],
-                    "name": "decimals",
-                    "outputs": [{"internalType": "uint8", "name": "", "type": "uint8"}],
-                    "stateMutability": "view",
-                    "type": "function"
-                }]
+            payload = _AGGREGATE3_SELECTOR + encode(
+                ['(address,bytes,bool)[]'],
+                [[(target, calldata, False) for target, calldata in calls]]
             )
+            raw = self.w3.eth.call({'to': MULTICALL3_ADDRESS, 'data': payload})
+            results = decode(['(bool,bytes)[]'], raw)[0]
 
-            decimals0 = token0.functions.decimals().call()
-            decimals1 = token1.functions.decimals().call()
+            reserves = decode(['uint112', 'uint112', 'uint32'], results[0][1])
+            next_result = 1
+            for token in (token0_address, token1_address):
+                if token not in self._decimals_cache:
+                    self._decimals_cache[token] = decode(['uint8'], results[next_result][1])[0]
+                    next_result += 1
+
+            decimals0 = self._decimals_cache[token0_address]
+            decimals1 = self._decimals_cache[token1_address]
 
             reserve0 = Decimal(str(reserves[0])) / Decimal(str(10 ** decimals0))
             reserve1 = Decimal(str(reserves[1])) / Decimal(str(10 ** decimals1))
@@ -101,12 +187,23 @@ class PriceCalculator:
             self.logger.error(f"Error getting price from pair: {str(e)}")
             return None
 
-    async def get_token_price_history(self, token_address: str, days: int = 30) -> List[float]:
+    async def get_token_price_history(self, token_address: str, days: int = 30) -> np.ndarray:
         """
         Get token price history using TheGraph API
-        Returns list of daily prices for specified number of days
+        Returns a contiguous float64 array of daily prices so the IL and
+        volatility math downstream runs straight on it without a per-call
+        list conversion
         """
         try:
+            cache_key = ('price_history', token_address.lower(), days)
+            prices = self._history_cache.get(cache_key)
+            if prices is None:
+                prices = self._disk_cache.get(cache_key)
+            if prices is not None:
+                prices = np.ascontiguousarray(prices, dtype=np.float64)
+                self._history_cache[cache_key] = prices
+                return prices
+
             # TheGraph endpoint for PancakeSwap
             url = "https://api.thegraph.com/subgraphs/name/pancakeswap/exchange-v2"
             
@@ -130,15 +227,24 @@ class PriceCalculator:
                 "days": days
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json={'query': query, 'variables': variables}) as response:
-                    data = await response.json()
-                    
-                    if 'errors' in data:
-                        raise Exception(f"GraphQL error: {data['errors']}")
-                        
-                    prices = [float(day['priceUSD']) for day in reversed(data['data']['tokenDayDatas'])]
-                    return prices
+            session = await self._get_session()
+            async with session.post(url, json={'query': query, 'variables': variables}) as response:
+                data = orjson.loads(await response.read())
+
+                if 'errors' in data:
+                    raise Exception(f"GraphQL error: {data['errors']}")
+
+                day_datas = data['data']['tokenDayDatas']
+                prices = np.fromiter(
+                    (float(day['priceUSD']) for day in reversed(day_datas)),
+                    dtype=np.float64,
+                    count=len(day_datas)
+                )
+                self._history_cache[cache_key] = prices
+                # diskcache pickles the array as-is; stored and reloaded
+                # copies both come back float64
+                self._disk_cache.set(cache_key, prices, expire=3600)
+                return prices
 
         except Exception as e:
             self.logger.error(f"Error getting price history: {str(e)}")
@@ -147,6 +253,11 @@ class PriceCalculator:
     async def get_pool_volume(self, pool_address: str, timeframe: int = 24) -> float:
         """Get pool trading volume for specified timeframe in hours"""
         try:
+            cache_key = ('pool_volume', pool_address.lower(), timeframe)
+            volume = self._volume_cache.get(cache_key)
+            if volume is not None:
+                return volume
+
             # TheGraph endpoint for PancakeSwap
             url = "https://api.thegraph.com/subgraphs/name/pancakeswap/exchange-v2"
             
@@ -172,23 +283,88 @@ class PriceCalculator:
                 "timestamp": timeframe_start
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json={'query': query, 'variables': variables}) as response:
-                    data = await response.json()
-                    
-                    if 'errors' in data:
-                        raise Exception(f"GraphQL error: {data['errors']}")
-                        
-                    volume = sum(float(hour['hourlyVolumeUSD']) for hour in data['data']['pairHourDatas'])
-                    return volume
+            session = await self._get_session()
+            async with session.post(url, json={'query': query, 'variables': variables}) as response:
+                data = orjson.loads(await response.read())
+
+                if 'errors' in data:
+                    raise Exception(f"GraphQL error: {data['errors']}")
+
+                # TheGraph has no sum aggregation for pairHourDatas, so sum
+                # the single requested field in one NumPy pass instead of a
+                # per-element Python generator
+                hours = data['data']['pairHourDatas']
+                volume = float(np.fromiter(
+                    (float(hour['hourlyVolumeUSD']) for hour in hours),
+                    dtype=np.float64,
+                    count=len(hours)
+                ).sum())
+                self._volume_cache[cache_key] = volume
+                return volume
 
         except Exception as e:
             self.logger.error(f"Error getting pool volume: {str(e)}")
             raise
 
-    async def calculate_price_impact(self, 
-        token_in: str, 
-        token_out: str, 
+    async def _get_reserve_in(self, token_in: str, token_out: str) -> int:
+        """Get the input-side reserve of the token_in/token_out pair, briefly cached"""
+        cache_key = (token_in.lower(), token_out.lower())
+        reserve_in = self._reserves_cache.get(cache_key)
+        if reserve_in is not None:
+            return reserve_in
+
+        pair_address = await self._get_pair_address(token_in, token_out)
+        if pair_address == "0x0000000000000000000000000000000000000000":
+            raise Exception(f"No pair found for {token_in}/{token_out}")
+
+        raw = self.w3.eth.call({'to': pair_address, 'data': _GET_RESERVES_CALLDATA})
+        reserves = decode(['uint112', 'uint112', 'uint32'], raw)
+
+        # v2 pairs order reserves by sorted token address
+        reserve_in = reserves[0] if token_in.lower() < token_out.lower() else reserves[1]
+        self._reserves_cache[cache_key] = reserve_in
+        return reserve_in
+
+    async def calculate_price_impact_local(self,
+        token_in: str,
+        token_out: str,
+        amount_in: int
+    ) -> float:
+        """
+        Closed-form constant-product price impact - no swap-simulation RPCs
+        For a v2 pair: impact = amount_in_with_fee / (reserve_in + amount_in_with_fee)
+        """
+        try:
+            reserve_in = await self._get_reserve_in(token_in, token_out)
+
+            amount_in_with_fee = amount_in * 9975  # 0.25% PancakeSwap fee
+            impact = amount_in_with_fee / (reserve_in * 10000 + amount_in_with_fee)
+
+            return float(impact * 100)
+
+        except Exception as e:
+            self.logger.error(f"Error calculating price impact locally: {str(e)}")
+            raise
+
+    async def calculate_price_impact_local_batch(self,
+        token_in: str,
+        token_out: str,
+        amounts_in: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized closed-form price impact for many trade sizes at once"""
+        try:
+            reserve_in = await self._get_reserve_in(token_in, token_out)
+
+            amounts_with_fee = np.asarray(amounts_in, dtype=np.float64) * 9975
+            return amounts_with_fee / (reserve_in * 10000 + amounts_with_fee) * 100.0
+
+        except Exception as e:
+            self.logger.error(f"Error calculating batch price impact: {str(e)}")
+            raise
+
+    async def calculate_price_impact(self,
+        token_in: str,
+        token_out: str,
         amount_in: int
     ) -> float:
         """Calculate price impact for a potential swap"""
@@ -1,9 +1,150 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import numpy as np
+import numba
 from decimal import Decimal
 import math
 
+@numba.njit(cache=True, fastmath=True)
+def _max_drawdown_nb(values: np.ndarray) -> float:
+    """JIT-compiled peak-tracking loop for maximum drawdown"""
+    peak = values[0]
+    max_drawdown = 0.0
+
+    for value in values:
+        if value > peak:
+            peak = value
+        drawdown = (peak - value) / peak
+        if drawdown > max_drawdown:
+            max_drawdown = drawdown
+
+    return max_drawdown
+
+@numba.njit(parallel=True, cache=True, fastmath=True)
+def _il_and_vol_batch(prices0: np.ndarray, prices1: np.ndarray,
+                      out_il: np.ndarray, out_vol: np.ndarray):
+    """
+    Fused IL-risk and volatility kernel over (K, D) price matrices
+    One pass per pool computes the worst-case closed-form IL and the
+    annualized token0 return volatility; pools run in parallel
+    """
+    K, D = prices0.shape
+    for k in numba.prange(K):
+        # Worst-case closed-form IL over the window: the v2 loss for a
+        # ratio move R from the window start is 2*sqrt(R)/(1+R) - 1
+        ratio0 = prices1[k, 0] / prices0[k, 0]
+        worst_il = 0.0
+        for d in range(D):
+            rel = (prices1[k, d] / prices0[k, d]) / ratio0
+            il = 2.0 * math.sqrt(rel) / (1.0 + rel) - 1.0
+            if -il > worst_il:
+                worst_il = -il
+        out_il[k] = min(1.0, worst_il)
+
+        # Annualized volatility of token0 daily returns
+        ret_sum = 0.0
+        ret_sq_sum = 0.0
+        for d in range(1, D):
+            ret = prices0[k, d] / prices0[k, d - 1] - 1.0
+            ret_sum += ret
+            ret_sq_sum += ret * ret
+        n = D - 1
+        if n > 0:
+            ret_mean = ret_sum / n
+            ret_var = ret_sq_sum / n - ret_mean * ret_mean
+            if ret_var < 0.0:
+                ret_var = 0.0
+            out_vol[k] = min(1.0, math.sqrt(ret_var) * math.sqrt(365.0))
+        else:
+            out_vol[k] = 0.0
+
+@numba.njit(cache=True, fastmath=True, nogil=True)
+def _composite_nb(tvl_score: float, volatility_score: float, age_score: float,
+                  il_risk: float, protocol_score: float) -> float:
+    """
+    Weighted composite risk as straight-line compiled arithmetic
+    No list/array temporaries and no GIL, so per-pool scoring can run
+    truly in parallel from worker threads
+    """
+    score = (
+        tvl_score * 0.25 +
+        volatility_score * 0.20 +
+        age_score * 0.15 +
+        il_risk * 0.20 +
+        (1.0 - protocol_score) * 0.20
+    )
+    return min(1.0, max(0.0, score))
+
+@numba.njit(cache=True, fastmath=True)
+def _pool_risk_nb(prices0: np.ndarray, prices1: np.ndarray,
+                  tvl: float, age_in_days: float,
+                  protocol_score: float):
+    """
+    Fused per-pool risk kernel: IL risk, volatility and the composite
+    score in one traversal of the price arrays
+    Replaces four separate Python calls that each re-walked the same
+    data; ladders and weights mirror the RiskCalculator tables
+    """
+    D = prices0.shape[0]
+
+    # Worst-case closed-form IL plus token0 return stats, single pass
+    ratio0 = prices1[0] / prices0[0]
+    worst_il = 0.0
+    ret_sum = 0.0
+    ret_sq_sum = 0.0
+    for d in range(D):
+        rel = (prices1[d] / prices0[d]) / ratio0
+        il = 2.0 * math.sqrt(rel) / (1.0 + rel) - 1.0
+        if -il > worst_il:
+            worst_il = -il
+        if d > 0:
+            ret = prices0[d] / prices0[d - 1] - 1.0
+            ret_sum += ret
+            ret_sq_sum += ret * ret
+
+    il_risk = min(1.0, worst_il)
+
+    if D > 1:
+        n = D - 1
+        ret_mean = ret_sum / n
+        ret_var = ret_sq_sum / n - ret_mean * ret_mean
+        if ret_var < 0.0:
+            ret_var = 0.0
+        volatility = min(1.0, math.sqrt(ret_var) * math.sqrt(365.0))
+    else:
+        volatility = 0.0
+
+    if tvl >= 10_000_000.0:
+        tvl_risk = 0.1
+    elif tvl >= 5_000_000.0:
+        tvl_risk = 0.3
+    elif tvl >= 1_000_000.0:
+        tvl_risk = 0.5
+    elif tvl >= 500_000.0:
+        tvl_risk = 0.7
+    else:
+        tvl_risk = 0.9
+
+    if age_in_days >= 365.0:
+        age_risk = 0.2
+    elif age_in_days >= 180.0:
+        age_risk = 0.4
+    elif age_in_days >= 90.0:
+        age_risk = 0.6
+    elif age_in_days >= 30.0:
+        age_risk = 0.8
+    else:
+        age_risk = 1.0
+
+    composite = (
+        tvl_risk * 0.25 +
+        volatility * 0.20 +
+        age_risk * 0.15 +
+        il_risk * 0.20 +
+        (1.0 - protocol_score) * 0.20
+    )
+    return il_risk, volatility, min(1.0, max(0.0, composite))
+
 class RiskCalculator:
     def __init__(self):
         self.RISK_WEIGHTS = {
@@ -21,6 +162,27 @@ class RiskCalculator:
             'biswap': 0.75
         }
 
+        # TVL thresholds in USD, descending: >$10M very low risk ... <$500K very high
+        self._TVL_THRESHOLDS = np.array([10_000_000, 5_000_000, 1_000_000, 500_000, 0], dtype=np.float64)
+        self._TVL_RISKS = np.array([0.1, 0.3, 0.5, 0.7, 0.9])
+
+        # Age thresholds in days, descending: >1 year very low risk ... <1 month very high
+        self._AGE_THRESHOLDS = np.array([365, 180, 90, 30, 0], dtype=np.float64)
+        self._AGE_RISKS = np.array([0.2, 0.4, 0.6, 0.8, 1.0])
+
+        # Negated ascending copies so searchsorted finds the first threshold <= value
+        self._NEG_TVL_THRESHOLDS = -self._TVL_THRESHOLDS
+        self._NEG_AGE_THRESHOLDS = -self._AGE_THRESHOLDS
+
+        # Composite weights as a vector, ordered (tvl, volatility, age, il, protocol)
+        self._risk_weight_vec = np.array([
+            self.RISK_WEIGHTS['tvl'],
+            self.RISK_WEIGHTS['volatility'],
+            self.RISK_WEIGHTS['age'],
+            self.RISK_WEIGHTS['il'],
+            self.RISK_WEIGHTS['protocol']
+        ])
+
     def calculate_impermanent_loss_risk(
         self,
         token0_price_history: List[float],
@@ -34,21 +196,19 @@ class RiskCalculator:
             if len(token0_price_history) != len(token1_price_history):
                 raise ValueError("Price history lengths must match")
 
-            # Calculate price ratios
-            price_ratios = [t1/t0 for t0, t1 in zip(token0_price_history, token1_price_history)]
-            
-            # Calculate price ratio volatility
-            ratio_volatility = np.std(price_ratios)
-            
-            # Calculate max drawdown
-            max_drawdown = self._calculate_max_drawdown(price_ratios)
-            
-            # Calculate IL risk score (higher volatility/drawdown = higher risk)
-            vol_score = min(1.0, ratio_volatility)
-            drawdown_score = min(1.0, max_drawdown)
-            
-            il_risk = (vol_score * 0.7 + drawdown_score * 0.3)
-            return il_risk
+            # Closed-form v2 IL: for a ratio move R from the window start,
+            # the loss versus holding is 2*sqrt(R)/(1+R) - 1 - it depends
+            # only on the endpoint ratio, not the path. One vectorized pass
+            # takes the worst case over the window as the risk score
+            t0 = np.asarray(token0_price_history, dtype=np.float64)
+            t1 = np.asarray(token1_price_history, dtype=np.float64)
+            ratios = t1 / t0
+            rel = ratios / ratios[0]
+            il = 2.0 * np.sqrt(rel) / (1.0 + rel) - 1.0
+
+            # il is <= 0 by construction; the most negative point is the
+            # worst realized loss in the window
+            return float(min(1.0, -il.min()))
 
         except Exception as e:
             raise Exception(f"Error calculating IL risk: {str(e)}")
@@ -62,11 +222,12 @@ class RiskCalculator:
             if len(price_history) < 2:
                 return 0.0
 
-            # Calculate daily returns
-            returns = np.diff(price_history) / price_history[:-1]
-            
+            # Calculate daily returns on a contiguous float64 array
+            prices = np.ascontiguousarray(price_history, dtype=np.float64)
+            returns = np.diff(prices) / prices[:-1]
+
             # Calculate annualized volatility
-            daily_vol = np.std(returns)
+            daily_vol = returns.std()
             annual_vol = daily_vol * math.sqrt(365)
             
             # Normalize to 0-1 range (assuming 100% annual vol as max)
@@ -77,54 +238,67 @@ class RiskCalculator:
         except Exception as e:
             raise Exception(f"Error calculating volatility: {str(e)}")
 
+    def volatility_batch(self, hist_matrix: np.ndarray) -> np.ndarray:
+        """
+        Annualized volatility scores for a (K, T) matrix of price histories
+        Rows may be NaN-padded on the right when histories have unequal
+        lengths - the nan-aware reduction ignores the padding. Same formula
+        as calculate_pool_volatility, one SIMD pass for all pools
+        """
+        try:
+            prices = np.asarray(hist_matrix, dtype=np.float64)
+            if prices.ndim != 2 or prices.shape[1] < 2:
+                return np.zeros(prices.shape[0] if prices.ndim == 2 else 1)
+
+            returns = np.diff(prices, axis=1) / prices[:, :-1]
+            annual_vol = np.nanstd(returns, axis=1) * math.sqrt(365.0)
+            return np.minimum(1.0, annual_vol)
+
+        except Exception as e:
+            raise Exception(f"Error calculating batch volatility: {str(e)}")
+
     def calculate_tvl_risk(self, tvl: float) -> float:
         """
         Calculate risk based on TVL
         Lower TVL = higher risk
         """
         try:
-            # TVL thresholds in USD
-            TVL_THRESHOLDS = {
-                10_000_000: 0.1,  # >$10M: very low risk
-                5_000_000: 0.3,   # >$5M: low risk
-                1_000_000: 0.5,   # >$1M: medium risk
-                500_000: 0.7,     # >$500K: high risk
-                0: 0.9            # <$500K: very high risk
-            }
-            
-            for threshold, risk in TVL_THRESHOLDS.items():
-                if tvl >= threshold:
-                    return risk
-                    
-            return 1.0  # Maximum risk for edge cases
+            idx = int(np.searchsorted(self._NEG_TVL_THRESHOLDS, -tvl, side='left'))
+            return float(self._TVL_RISKS[min(idx, len(self._TVL_RISKS) - 1)])
 
         except Exception as e:
             raise Exception(f"Error calculating TVL risk: {str(e)}")
 
+    def calculate_tvl_risk_batch(self, tvls: np.ndarray) -> np.ndarray:
+        """Vectorized TVL risk lookup for portfolio-level scoring"""
+        tvls = np.asarray(tvls, dtype=np.float64)
+        idx = np.minimum(
+            np.searchsorted(self._NEG_TVL_THRESHOLDS, -tvls, side='left'),
+            len(self._TVL_RISKS) - 1
+        )
+        return self._TVL_RISKS[idx]
+
     def calculate_age_risk(self, age_in_days: int) -> float:
         """
         Calculate risk based on pool age
         Newer pools = higher risk
         """
         try:
-            # Age thresholds in days
-            AGE_THRESHOLDS = {
-                365: 0.2,   # >1 year: very low risk
-                180: 0.4,   # >6 months: low risk
-                90: 0.6,    # >3 months: medium risk
-                30: 0.8,    # >1 month: high risk
-                0: 1.0      # <1 month: very high risk
-            }
-            
-            for threshold, risk in AGE_THRESHOLDS.items():
-                if age_in_days >= threshold:
-                    return risk
-                    
-            return 1.0
+            idx = int(np.searchsorted(self._NEG_AGE_THRESHOLDS, -age_in_days, side='left'))
+            return float(self._AGE_RISKS[min(idx, len(self._AGE_RISKS) - 1)])
 
         except Exception as e:
             raise Exception(f"Error calculating age risk: {str(e)}")
 
+    def calculate_age_risk_batch(self, ages_in_days: np.ndarray) -> np.ndarray:
+        """Vectorized age risk lookup for portfolio-level scoring"""
+        ages = np.asarray(ages_in_days, dtype=np.float64)
+        idx = np.minimum(
+            np.searchsorted(self._NEG_AGE_THRESHOLDS, -ages, side='left'),
+            len(self._AGE_RISKS) - 1
+        )
+        return self._AGE_RISKS[idx]
+
     def calculate_protocol_health_score(self, 
         protocol: str,
         tvl_history: List[float],
@@ -135,31 +309,52 @@ class RiskCalculator:
         Calculate protocol health score based on various metrics
         """
         try:
-            base_score = self.PROTOCOL_BASE_SCORES.get(protocol.lower(), 0.5)
-            
-            # TVL growth score
-            tvl_growth = (tvl_history[-1] / tvl_history[0] - 1) if len(tvl_history) > 1 else 0
-            tvl_growth_score = min(1.0, max(0.0, (tvl_growth + 0.5) / 1.5))
-            
-            # User adoption score
-            user_score = min(1.0, user_count / 100000)  # Normalize to 100K users
-            
-            # Audit freshness score
-            audit_score = max(0.0, min(1.0, days_since_audit / 365))
-            
-            # Weighted average
-            health_score = (
-                base_score * 0.4 +
-                tvl_growth_score * 0.2 +
-                user_score * 0.2 +
-                audit_score * 0.2
+            scores = self.calculate_protocol_health_score_batch(
+                [protocol],
+                np.atleast_2d(np.asarray(tvl_history, dtype=np.float64)),
+                np.array([user_count], dtype=np.float64),
+                np.array([days_since_audit], dtype=np.float64)
             )
-            
-            return float(health_score)
+            return float(scores[0])
 
         except Exception as e:
             raise Exception(f"Error calculating protocol health: {str(e)}")
 
+    def calculate_protocol_health_score_batch(self,
+        protocols: List[str],
+        tvl_histories: np.ndarray,
+        user_counts: np.ndarray,
+        days_since_audit: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized protocol health scoring over K protocols at once
+        tvl_histories is a (K, D) matrix of TVL samples per protocol
+        """
+        base_scores = np.array([
+            self.PROTOCOL_BASE_SCORES.get(p.lower(), 0.5) for p in protocols
+        ])
+
+        tvl_histories = np.asarray(tvl_histories, dtype=np.float64)
+        if tvl_histories.ndim == 2 and tvl_histories.shape[1] > 1:
+            tvl_growth = tvl_histories[:, -1] / tvl_histories[:, 0] - 1
+        else:
+            tvl_growth = np.zeros(len(protocols))
+        tvl_growth_scores = np.clip((tvl_growth + 0.5) / 1.5, 0.0, 1.0)
+
+        # User adoption, normalized to 100K users
+        user_scores = np.clip(np.asarray(user_counts, dtype=np.float64) / 100000, 0.0, 1.0)
+
+        # Audit freshness
+        audit_scores = np.clip(np.asarray(days_since_audit, dtype=np.float64) / 365, 0.0, 1.0)
+
+        # Weighted average
+        return (
+            base_scores * 0.4 +
+            tvl_growth_scores * 0.2 +
+            user_scores * 0.2 +
+            audit_scores * 0.2
+        )
+
     def calculate_composite_risk_score(self,
         tvl_score: float,
         volatility_score: float,
@@ -172,28 +367,71 @@ class RiskCalculator:
         Returns a value between 0 (lowest risk) and 1 (highest risk)
         """
         try:
-            composite_score = (
-                tvl_score * self.RISK_WEIGHTS['tvl'] +
-                volatility_score * self.RISK_WEIGHTS['volatility'] +
-                age_score * self.RISK_WEIGHTS['age'] +
-                il_risk * self.RISK_WEIGHTS['il'] +
-                (1 - protocol_score) * self.RISK_WEIGHTS['protocol']
-            )
-            
-            return min(1.0, max(0.0, float(composite_score)))
+            return float(_composite_nb(
+                tvl_score, volatility_score, age_score, il_risk, protocol_score
+            ))
 
         except Exception as e:
             raise Exception(f"Error calculating composite risk: {str(e)}")
 
+    def compute_pool_risk(self,
+        token0_history: np.ndarray,
+        token1_history: np.ndarray,
+        tvl: float,
+        age_in_days: float,
+        protocol_score: float
+    ) -> Tuple[float, float, float]:
+        """
+        Compute (il_risk, volatility_score, composite_risk) for one pool
+        in a single fused kernel pass over the price histories
+        """
+        try:
+            p0 = np.ascontiguousarray(token0_history, dtype=np.float64)
+            p1 = np.ascontiguousarray(token1_history, dtype=np.float64)
+            if p0.shape != p1.shape:
+                raise ValueError("Price history lengths must match")
+
+            return _pool_risk_nb(
+                p0, p1, float(tvl), float(age_in_days), float(protocol_score)
+            )
+
+        except Exception as e:
+            raise Exception(f"Error computing pool risk: {str(e)}")
+
+    def score_portfolio_batch(self,
+        token0_histories: np.ndarray,
+        token1_histories: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute IL risk and pool volatility for K pools at once
+        Takes (K, D) matrices of aligned daily prices and returns
+        (il_risks, volatility_scores); pools are processed in parallel by
+        the fused Numba kernel
+        """
+        try:
+            prices0 = np.ascontiguousarray(token0_histories, dtype=np.float64)
+            prices1 = np.ascontiguousarray(token1_histories, dtype=np.float64)
+
+            if prices0.shape != prices1.shape:
+                raise ValueError("Price history shapes must match")
+
+            out_il = np.empty(prices0.shape[0])
+            out_vol = np.empty(prices0.shape[0])
+            _il_and_vol_batch(prices0, prices1, out_il, out_vol)
+            return out_il, out_vol
+
+        except Exception as e:
+            raise Exception(f"Error scoring portfolio batch: {str(e)}")
+
+    def calculate_composite_risk_score_batch(self, scores: np.ndarray) -> np.ndarray:
+        """
+        Vectorized composite risk over an (N, 5) matrix of factor scores
+        Columns ordered (tvl, volatility, age, il, 1 - protocol); one
+        matrix-vector product scores the whole portfolio
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        return np.clip(scores @ self._risk_weight_vec, 0.0, 1.0)
+
     def _calculate_max_drawdown(self, values: List[float]) -> float:
         """Helper function to calculate maximum drawdown"""
-        peak = values[0]
-        max_drawdown = 0.0
-        
-        for value in values:
-            if value > peak:
-                peak = value
-            drawdown = (peak - value) / peak
-            max_drawdown = max(max_drawdown, drawdown)
-            
-        return max_drawdown 
\ No newline at end of file
+        return float(_max_drawdown_nb(np.asarray(values, dtype=np.float64))) 
\ No newline at end of file
@@ -0,0 +1,81 @@
+import numba
+import numpy as np
+
+
+@numba.njit(parallel=True, cache=True, fastmath=True)
+def risk_score_batch(tvl: np.ndarray,
+                     apr: np.ndarray,
+                     age: np.ndarray,
+                     prot_risk: np.ndarray) -> np.ndarray:
+    """
+    Fused composite risk kernel over N pools
+    Evaluates the tvl/apr/age/liquidity threshold ladders and the weighted
+    sum in one parallel pass - no intermediate factor arrays are
+    materialized. Thresholds and weights mirror YieldScanner's tables
+    """
+    n = tvl.shape[0]
+    out = np.empty(n)
+
+    for i in numba.prange(n):
+        t = tvl[i]
+
+        if t >= 10_000_000.0:
+            tvl_r = 0.1
+        elif t >= 1_000_000.0:
+            tvl_r = 0.3
+        elif t >= 100_000.0:
+            tvl_r = 0.6
+        else:
+            tvl_r = 0.9
+
+        a = apr[i]
+        if a <= 15.0:
+            apr_r = 0.2
+        elif a <= 50.0:
+            apr_r = 0.4
+        elif a <= 100.0:
+            apr_r = 0.6
+        elif a <= 1000.0:
+            apr_r = 0.8
+        else:
+            apr_r = 1.0
+
+        d = age[i]
+        if d >= 365.0:
+            age_r = 0.2
+        elif d >= 180.0:
+            age_r = 0.4
+        elif d >= 90.0:
+            age_r = 0.6
+        elif d >= 30.0:
+            age_r = 0.8
+        else:
+            age_r = 1.0
+
+        if t >= 5_000_000.0:
+            liq_r = 0.1
+        elif t >= 1_000_000.0:
+            liq_r = 0.3
+        elif t >= 500_000.0:
+            liq_r = 0.5
+        elif t >= 100_000.0:
+            liq_r = 0.7
+        else:
+            liq_r = 0.9
+
+        score = (
+            tvl_r * 0.3 +
+            prot_risk[i] * 0.2 +
+            apr_r * 0.2 +
+            age_r * 0.15 +
+            liq_r * 0.15
+        )
+        out[i] = min(1.0, max(0.0, score))
+
+    return out
+
+
+def warmup():
+    """Trigger JIT compilation at startup instead of on the first scan"""
+    zeros = np.zeros(1)
+    risk_score_batch(zeros, zeros, zeros, zeros)